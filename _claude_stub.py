@@ -0,0 +1,36 @@
+"""
+Deterministic Claude stub for test modules.
+
+Replaces app.ANTHROPIC_CLIENT with a mock that scores every document 0.7, so the suites
+run in seconds without network access. Set INTEGRATION_LIVE=1 to send real Claude requests.
+"""
+
+import os
+from unittest.mock import Mock, patch
+
+_patcher = None
+
+
+def start():
+    """Stub the app's Claude client unless INTEGRATION_LIVE is set and return the stub, or None"""
+    global _patcher
+    stop()
+    if os.getenv("INTEGRATION_LIVE"):
+        return None
+    import app
+    stub_client = Mock()
+    stub_client.messages.create.return_value = Mock(content=[Mock(text="0.7")])
+    _patcher = patch.object(app, 'ANTHROPIC_CLIENT', stub_client)
+    _patcher.start()
+    app.claude_cache.clear()
+    return stub_client
+
+
+def stop():
+    """Restore the real Claude client and drop any stubbed scores"""
+    global _patcher
+    if _patcher is not None:
+        import app
+        _patcher.stop()
+        _patcher = None
+        app.claude_cache.clear()
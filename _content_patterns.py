@@ -0,0 +1,17 @@
+"""
+Corpus content patterns shared by the test modules.
+
+Each keyword check is one precompiled regex scan per document instead of a lower() copy
+followed by one substring test per keyword.
+"""
+
+import re
+
+# Default (legal) corpus keywords, matched case-insensitively
+LEGAL_RE = re.compile(r'legal|contract|liability', re.IGNORECASE)
+LEGAL_OR_RISK_RE = re.compile(r'legal|contract|liability|risk', re.IGNORECASE)
+LEGAL_OR_COMPLIANCE_RE = re.compile(r'legal|contract|liability|risk|compliance', re.IGNORECASE)
+
+# Book of Mormon keywords, matched case-sensitively
+MORMON_RE = re.compile(r'Nephi|Jacob|wilderness')
+MORMON_OR_RECORD_RE = re.compile(r'Nephi|Jacob|wilderness|Lord|record')
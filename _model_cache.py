@@ -0,0 +1,38 @@
+"""
+Throwaway model cache for test modules.
+
+Points app.MODEL_CACHE_DIR at a temporary directory for the duration of a test module,
+so persisted vectorizers, FAISS indexes and chunked corpora never land in the workspace
+and no run can load entries left behind by an earlier one.
+"""
+
+import os
+import tempfile
+from unittest.mock import patch
+
+_tmp_dir = None
+_patcher = None
+
+
+def start():
+    """Send all model and corpus cache writes to a fresh temporary directory and return its path"""
+    global _tmp_dir, _patcher
+    stop()
+    _tmp_dir = tempfile.TemporaryDirectory()
+    # If this is app's first import, keep the models it builds at import time out of any configured cache
+    with patch.dict(os.environ, {"MODEL_CACHE_DIR": ""}):
+        import app
+    _patcher = patch.object(app, 'MODEL_CACHE_DIR', _tmp_dir.name)
+    _patcher.start()
+    return _tmp_dir.name
+
+
+def stop():
+    """Restore the app's cache directory and delete the temporary one"""
+    global _tmp_dir, _patcher
+    if _patcher is not None:
+        _patcher.stop()
+        _patcher = None
+    if _tmp_dir is not None:
+        _tmp_dir.cleanup()
+        _tmp_dir = None
@@ -1,104 +1,232 @@
 from flask import Flask, request, jsonify
+from flask.json.provider import JSONProvider
+import orjson
 import numpy as np
 import faiss
 import requests
 import os
 import re
-from sklearn.feature_extraction.text import TfidfVectorizer
+import hashlib
+import threading
+import shutil
+import tempfile
+import mmap
+import pickle
+import functools
+from collections import OrderedDict
+from dataclasses import dataclass
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
+import joblib
+import sklearn
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sklearn.base import clone
+from sklearn.pipeline import make_pipeline
 import anthropic
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider that encodes and decodes request/response bodies with orjson"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 # Constants
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
 ANTHROPIC_CLIENT = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
+CLAUDE_MAX_CONCURRENCY = 5  # Concurrent Claude scoring requests per batch
+EMBEDDING_CACHE_SIZE = 4096  # Maximum number of cached query/document embeddings
+CLAUDE_CACHE_SIZE = 2048  # Maximum number of cached Claude relevance scores
+MAX_QUERY_CHARS = 2048  # Longer query text is truncated before TF-IDF tokenization
+TOP_K = 3  # Documents retrieved per query
+
+# Shared worker pool for concurrent Claude scoring
+claude_executor = ThreadPoolExecutor(max_workers=CLAUDE_MAX_CONCURRENCY)
 
 # Configuration
-CORPUS_SOURCE = os.getenv("CORPUS_SOURCE", "default")  # "default" or "mormon"
+DEFAULT_CORPUS_SOURCE = "default"  # "default" or "mormon"
+DEFAULT_CHUNK_SIZE = 500  # Characters per chunk
+DEFAULT_CHUNK_OVERLAP = 50  # Overlap between chunks
+
+@dataclass(frozen=True)
+class CorpusEnv:
+    """Corpus settings read from the environment once at startup"""
+    source: str
+    chunk_size: int
+    chunk_overlap: int
 
-# Handle CHUNK_SIZE with error handling
-try:
-    CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", "500"))  # Characters per chunk
-except (ValueError, TypeError):
-    CHUNK_SIZE = 500  # Default fallback
+def read_corpus_env(environ=os.environ):
+    """Read corpus settings from environ, falling back to defaults for missing or invalid values"""
+    source = environ.get("CORPUS_SOURCE", DEFAULT_CORPUS_SOURCE)
+
+    # Handle CHUNK_SIZE with error handling
+    try:
+        chunk_size = int(environ.get("CHUNK_SIZE", DEFAULT_CHUNK_SIZE))
+    except (ValueError, TypeError):
+        chunk_size = DEFAULT_CHUNK_SIZE
+
+    # Handle CHUNK_OVERLAP with error handling
+    try:
+        chunk_overlap = int(environ.get("CHUNK_OVERLAP", DEFAULT_CHUNK_OVERLAP))
+    except (ValueError, TypeError):
+        chunk_overlap = DEFAULT_CHUNK_OVERLAP
 
-# Handle CHUNK_OVERLAP with error handling  
-try:
-    CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", "50"))  # Overlap between chunks
-except (ValueError, TypeError):
-    CHUNK_OVERLAP = 50  # Default fallback
+    return CorpusEnv(source, chunk_size, chunk_overlap)
+
+# Settings consulted by load_corpus; override with dataclasses.replace() or configure() instead of mutating os.environ
+_ENV = read_corpus_env()
+
+# FAISS index configuration
+FAISS_INDEX_TYPE = os.getenv("FAISS_INDEX_TYPE", "auto")  # "auto", "hnsw", "flat" or "sq8"
+SMALL_CORPUS_SIZE = 1000  # "auto" searches corpora below this many chunks exactly, larger ones with HNSW
+HNSW_M = 32  # Graph neighbours per node
+HNSW_EF_CONSTRUCTION = 200  # Candidate list size while building the graph
+HNSW_EF_SEARCH = 64  # Candidate list size while searching
+
+# Embedding dimension of the hashed TF-IDF features
+HASH_N_FEATURES = 2 ** 14
+
+# Directory where the fitted vectorizer, FAISS index and chunked Mormon corpus are persisted between runs
+MODEL_CACHE_DIR = os.getenv("MODEL_CACHE_DIR", "")  # Empty (the default) disables persistence
+CORPUS_CACHE_VERSION = 1  # Bump when parsing or chunking changes so stale corpus caches are ignored
+_DISABLE_CACHE = False  # Tests set this to keep load_mormon_corpus off the on-disk corpus cache entirely
+
+# Mormon text file
+MORMON_TEXT_PATH = 'data/mormon13short.txt'
+
+# Verse parsing patterns, compiled once at import
+VERSE_LINE_RE = re.compile(r'^\s*\d+\s+([A-Z].*)')  # " 1 I, Nephi, ..." -> "I, Nephi, ..."
+CHAPTER_HEADING_RE = re.compile(r'^1 Nephi \d+$')
+
+def iter_text_lines(path):
+    """Yield the lines of a UTF-8 text file, reading it through a read-only memory map"""
+    with open(path, 'rb') as file:
+        try:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return  # Empty files can't be mapped and have no lines
+        with mapped:
+            for line in iter(mapped.readline, b""):
+                yield line.decode('utf-8')
+
+def mormon_cache_path(chunk_size, chunk_overlap):
+    """Return where the chunked Mormon corpus is cached for the current data file, or None"""
+    if _DISABLE_CACHE or not MODEL_CACHE_DIR:
+        return None
+    try:
+        stat = os.stat(MORMON_TEXT_PATH)
+    except OSError:
+        return None
+    name = f"mormon-v{CORPUS_CACHE_VERSION}-{stat.st_mtime_ns}-{stat.st_size}-{chunk_size}-{chunk_overlap}.pkl"
+    return os.path.join(MODEL_CACHE_DIR, name)
+
+def load_cached_corpus(cache_path):
+    """Return the pickled corpus at cache_path, or None if it is missing or unreadable"""
+    try:
+        with open(cache_path, 'rb') as file:
+            return pickle.load(file)
+    except Exception:
+        return None
+
+def save_cached_corpus(cache_path, corpus):
+    """Pickle the corpus to cache_path, publishing the file atomically"""
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+        with open(tmp_path, 'wb') as file:
+            pickle.dump(corpus, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        print(f"Could not cache corpus to {cache_path}: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
 
 def load_mormon_corpus():
     """Load and chunk the Mormon text from the data file."""
+    chunk_size, chunk_overlap = _ENV.chunk_size, _ENV.chunk_overlap
+    # Reuse the chunks from an earlier run on the same file and settings
+    cache_path = mormon_cache_path(chunk_size, chunk_overlap)
+    cached_corpus = load_cached_corpus(cache_path) if cache_path else None
+    if cached_corpus is not None:
+        return cached_corpus
+    
     try:
-        with open('data/mormon13short.txt', 'r', encoding='utf-8') as file:
-            content = file.read()
-        
         # Split into verses - the format is "1 Nephi 1:1" followed by verse number and content
         verses = []
-        lines = content.split('\n')
+        # Lines kept by the more general approach, used only if no standard verses are found
+        fallback_verses = []
         
-        for line in lines:
+        # Walk the memory-mapped file line by line instead of reading it into one string
+        for line in iter_text_lines(MORMON_TEXT_PATH):
             line = line.strip()
             # Look for verse lines that start with a number and contain actual verse content
             # Format: " 1 I, Nephi, having been born of goodly parents..."
-            if re.match(r'^\s*\d+\s+[A-Z]', line) and len(line) > 30:
+            verse_match = VERSE_LINE_RE.match(line)
+            if verse_match and len(line) > 30:
                 # Extract the verse content (everything after the verse number)
-                verse_match = re.search(r'^\s*\d+\s+(.+)', line)
-                if verse_match:
-                    verse_content = verse_match.group(1).strip()
-                    if verse_content and len(verse_content) > 20:  # Filter out very short lines
-                        verses.append(verse_content)
+                verse_content = verse_match.group(1).strip()
+                if verse_content and len(verse_content) > 20:  # Filter out very short lines
+                    verses.append(verse_content)
+            # Look for any line that seems to contain substantial text content
+            if not verses and (len(line) > 50 and
+                not line.startswith('*') and
+                not line.startswith('[') and
+                not line.startswith('Chapter') and
+                not CHAPTER_HEADING_RE.match(line) and
+                not line.isupper() and
+                'Nephi' in line or 'Lord' in line or 'came to pass' in line):
+                fallback_verses.append(line)
         
-        # If no verses found with the above pattern, try a more general approach
+        # If no verses found with the above pattern, fall back to the more general approach
         if len(verses) == 0:
             print("No verses found with standard pattern, trying alternative parsing...")
-            for line in lines:
-                line = line.strip()
-                # Look for any line that seems to contain substantial text content
-                if (len(line) > 50 and
-                    not line.startswith('*') and
-                    not line.startswith('[') and
-                    not line.startswith('Chapter') and
-                    not re.match(r'^1 Nephi \d+$', line) and
-                    not line.isupper() and
-                    'Nephi' in line or 'Lord' in line or 'came to pass' in line):
-                    verses.append(line)
+            verses = fallback_verses
         
         # Create chunks from verses
         corpus = []
-        current_chunk = ""
+        # Pieces of the current chunk, joined with spaces only when the chunk is emitted
+        current_parts = []
+        current_len = 0  # Length of " ".join(current_parts)
         chunk_id = 1
         
         for verse in verses:
             # If adding this verse would exceed chunk size, save current chunk and start new one
-            if len(current_chunk) + len(verse) + 1 > CHUNK_SIZE and current_chunk:
+            if current_len + len(verse) + 1 > chunk_size and current_parts:
+                current_chunk = " ".join(current_parts)
                 corpus.append({
                     "title": f"Book of Mormon - Chunk {chunk_id}",
                     "content": current_chunk.strip()
                 })
                 chunk_id += 1
                 # Start new chunk with overlap
-                if CHUNK_OVERLAP > 0 and len(current_chunk) > CHUNK_OVERLAP:
-                    current_chunk = current_chunk[-CHUNK_OVERLAP:] + " " + verse
+                if chunk_overlap > 0 and current_len > chunk_overlap:
+                    current_parts = [current_chunk[-chunk_overlap:], verse]
+                    current_len = chunk_overlap + 1 + len(verse)
                 else:
-                    current_chunk = verse
+                    current_parts = [verse]
+                    current_len = len(verse)
             else:
                 # Add verse to current chunk
-                if current_chunk:
-                    current_chunk += " " + verse
-                else:
-                    current_chunk = verse
+                current_len += len(verse) + (1 if current_parts else 0)
+                current_parts.append(verse)
         
         # Add the last chunk if it has content
-        if current_chunk.strip():
+        current_chunk = " ".join(current_parts).strip()
+        if current_chunk:
             corpus.append({
                 "title": f"Book of Mormon - Chunk {chunk_id}",
-                "content": current_chunk.strip()
+                "content": current_chunk
             })
         
         print(f"Loaded {len(corpus)} chunks from Mormon text (parsed {len(verses)} verses)")
@@ -106,89 +234,237 @@ def load_mormon_corpus():
         # If we still have no corpus, fall back to default
         if len(corpus) == 0:
             print("No content could be parsed from Mormon text, falling back to default corpus")
-            return get_default_corpus()
-            
+            return list(get_default_corpus())
+        
+        if cache_path:
+            save_cached_corpus(cache_path, corpus)
         return corpus
         
     except FileNotFoundError:
         print("Mormon text file not found, falling back to default corpus")
-        return get_default_corpus()
+        return list(get_default_corpus())
     except Exception as e:
         print(f"Error loading Mormon corpus: {e}, falling back to default corpus")
-        return get_default_corpus()
+        return list(get_default_corpus())
+
+# Default sample corpus, built once as read-only documents so callers cannot mutate it
+_DEFAULT_CORPUS = tuple(MappingProxyType(doc) for doc in (
+    {"title": "Legal Risk Report - 2023", "content": "The contract exposes the organization to liability due to lack of indemnification clauses."},
+    {"title": "Security Memo", "content": "Ensure all employees use 2FA to reduce unauthorized access risks."},
+    {"title": "Financial Summary", "content": "Revenue grew by 15% but legal expenses increased due to ongoing litigation."}
+))
 
 def get_default_corpus():
-    """Return the default sample corpus."""
-    return [
-        {"title": "Legal Risk Report - 2023", "content": "The contract exposes the organization to liability due to lack of indemnification clauses."},
-        {"title": "Security Memo", "content": "Ensure all employees use 2FA to reduce unauthorized access risks."},
-        {"title": "Financial Summary", "content": "Revenue grew by 15% but legal expenses increased due to ongoing litigation."}
-    ]
+    """Return the default sample corpus (shared and read-only)."""
+    return _DEFAULT_CORPUS
 
 def load_corpus():
     """Load the corpus based on configuration."""
-    if CORPUS_SOURCE.lower() == "mormon":
+    if _ENV.source.lower() == "mormon":
         return load_mormon_corpus()
     else:
-        return get_default_corpus()
-
-# Load the corpus
-corpus = load_corpus()
+        return list(get_default_corpus())
 
 # Initialize TF-IDF vectorizer for embeddings (since Anthropic doesn't provide embeddings)
-vectorizer = TfidfVectorizer(max_features=1000, stop_words='english')
+# Terms are hashed with MurmurHash3 into a fixed space, so no vocabulary dict is kept
+vectorizer = make_pipeline(
+    HashingVectorizer(n_features=HASH_N_FEATURES, alternate_sign=False, norm=None,
+                      stop_words='english', dtype=np.float32),
+    TfidfTransformer())
+
+class LRUCache:
+    """Thread-safe bounded mapping that evicts the least recently used entry"""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value for key, or None if it isn't cached"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        """Cache value under key, evicting the oldest entry when full"""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+def text_digest(*parts):
+    """Return the SHA-256 digest used as a cache key for one or more pieces of text"""
+    return hashlib.sha256("\x00".join(parts).encode("utf-8")).digest()
+
+# Embeddings keyed by the SHA-256 digest of the input text
+embedding_cache = LRUCache(EMBEDDING_CACHE_SIZE)
 
 # Helper function to get embeddings using TF-IDF
 def get_embedding(text):
-    """Create embeddings using TF-IDF since Anthropic doesn't provide embeddings API"""
-    return vectorizer.transform([text]).toarray()[0]
+    """Create float32 embeddings using TF-IDF since Anthropic doesn't provide embeddings API"""
+    # Tokenization is O(chars); text beyond the cap adds cost without changing the ranking meaningfully
+    text = text[:MAX_QUERY_CHARS]
+    key = text_digest(text)
+    embedding = embedding_cache.get(key)
+    if embedding is None:
+        embedding = vectorizer.transform([text]).toarray()[0].astype(np.float32, copy=False)
+        embedding_cache.put(key, embedding)
+    return embedding.copy()  # Copy so callers can't mutate the cached vector
+
+# Helper function to embed many texts with a single TF-IDF transform
+def get_embeddings(texts):
+    """Create a (len(texts), dim) float32 embedding matrix in one vectorizer pass"""
+    return vectorizer.transform(texts).toarray().astype(np.float32, copy=False)
+
+# Claude relevance scores keyed by the SHA-256 digest of the (query, text) pair
+claude_cache = LRUCache(CLAUDE_CACHE_SIZE)
 
 # Helper function to use Anthropic Claude for text generation/analysis
 def analyze_with_claude(text, query):
     """Use Anthropic Claude to analyze relevance between query and text"""
+    key = text_digest(query, text)
+    cached_score = claude_cache.get(key)
+    if cached_score is not None:
+        return cached_score
     try:
         message = ANTHROPIC_CLIENT.messages.create(
             model="claude-3-sonnet-20240229",
-            max_tokens=100,
+            max_tokens=4,  # A score like "0.85" needs at most 4 output tokens
+            temperature=0,  # Deterministic scores for the same query/text pair
             messages=[
                 {
                     "role": "user",
-                    "content": f"Rate the relevance of this text to the query on a scale of 0-1. Query: '{query}' Text: '{text}' Return only a number between 0 and 1."
+                    "content": f"Rate the relevance of this text to the query on a scale of 0-1. Query: '{query}' Text: '{text}' Return only a decimal between 0 and 1, no text."
                 }
             ]
         )
         score = float(message.content[0].text.strip())
-        return max(0, min(1, score))  # Ensure score is between 0 and 1
+        score = max(0, min(1, score))  # Ensure score is between 0 and 1
+        claude_cache.put(key, score)  # Only successful scores are cached, never the fallback
+        return score
     except Exception as e:
         print(f"Claude analysis error: {e}")
         return 0.5  # Default score if Claude fails
 
-# Build FAISS index with TF-IDF embeddings
-texts = [doc["content"] for doc in corpus]
-# Fit vectorizer on all texts first
-vectorizer.fit(texts)
-doc_embeddings = np.array([get_embedding(text) for text in texts]).astype("float32")
-dimension = doc_embeddings.shape[1]
-index = faiss.IndexFlatIP(dimension)
-index.add(doc_embeddings)
+# Helper function to score several documents with Claude at once
+def analyze_with_claude_batch(pairs):
+    """Score (text, query) pairs with Claude concurrently, preserving input order"""
+    # Each request falls back to the default score independently on failure
+    return list(claude_executor.map(lambda pair: analyze_with_claude(*pair), pairs))
 
-@app.route("/rag-query", methods=["POST"])
-def rag_query():
-    data = request.json
-    query = data.get("query")
+def build_index(embeddings):
+    """Build an inner-product FAISS index over the given embedding matrix"""
+    # FAISS copies anything that isn't C-contiguous float32; this is a no-op for get_embeddings output
+    embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+    dimension = embeddings.shape[1]
+    index_type = FAISS_INDEX_TYPE.lower()
+    if index_type == "auto":
+        # A graph only pays off once a full scan gets expensive
+        index_type = "flat" if len(embeddings) < SMALL_CORPUS_SIZE else "hnsw"
+    if index_type == "flat":
+        # Exact brute-force search
+        index = faiss.IndexFlatIP(dimension)
+    elif index_type == "sq8":
+        # Brute-force search over 8-bit codes - a quarter of the float32 memory traffic.
+        # TF-IDF values are non-negative and bounded, so top-k ordering is preserved.
+        index = faiss.IndexScalarQuantizer(dimension, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT)
+        index.train(embeddings)
+    else:
+        # Approximate search that follows the HNSW graph instead of scanning every vector
+        index = faiss.IndexHNSWFlat(dimension, HNSW_M, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+        index.hnsw.efSearch = HNSW_EF_SEARCH
+    index.add(embeddings)
+    return index
+
+def models_fingerprint(texts):
+    """Return a hex digest identifying the corpus and settings the models are built from"""
+    settings = [sklearn.__version__, faiss.__version__, FAISS_INDEX_TYPE.lower(),
+                repr(sorted(vectorizer.get_params().items()))]
+    return text_digest(*settings, *texts).hex()
+
+def load_models(model_dir):
+    """Load a persisted vectorizer and memory-mapped FAISS index, or return None"""
+    try:
+        loaded_vectorizer = joblib.load(os.path.join(model_dir, "tfidf.joblib"))
+        index_path = os.path.join(model_dir, "corpus.faiss")
+        try:
+            loaded_index = faiss.read_index(index_path, faiss.IO_FLAG_MMAP)
+        except RuntimeError:
+            # Not every index type supports memory mapping
+            loaded_index = faiss.read_index(index_path)
+    except Exception:
+        return None
+    if isinstance(loaded_index, faiss.IndexHNSW):
+        loaded_index.hnsw.efSearch = HNSW_EF_SEARCH
+    return loaded_vectorizer, loaded_index
+
+def save_models(model_dir, fitted_vectorizer, built_index):
+    """Persist the fitted vectorizer and FAISS index, publishing the directory atomically"""
+    parent_dir = os.path.dirname(model_dir) or "."
+    tmp_dir = None
+    try:
+        os.makedirs(parent_dir, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(dir=parent_dir)
+        joblib.dump(fitted_vectorizer, os.path.join(tmp_dir, "tfidf.joblib"))
+        faiss.write_index(built_index, os.path.join(tmp_dir, "corpus.faiss"))
+        # Fail rather than publish a directory with a missing file
+        if not all(os.path.getsize(os.path.join(tmp_dir, name)) for name in ("tfidf.joblib", "corpus.faiss")):
+            raise OSError("incomplete model files")
+        os.replace(tmp_dir, model_dir)
+    except Exception as e:
+        print(f"Could not persist models to {model_dir}: {e}")
+        if tmp_dir:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+@functools.lru_cache(maxsize=4)
+def build_models(texts):
+    """Return a fitted vectorizer and FAISS index for a tuple of corpus texts, memoized per corpus"""
+    model_dir = os.path.join(MODEL_CACHE_DIR, models_fingerprint(texts)) if MODEL_CACHE_DIR else None
+    loaded_models = load_models(model_dir) if model_dir else None
+    if loaded_models:
+        return loaded_models
+    # Fit a fresh copy of the vectorizer and embed the texts in the same pass, so the corpus is tokenized once
+    fitted_vectorizer = clone(vectorizer)
+    embeddings = fitted_vectorizer.fit_transform(texts).toarray().astype(np.float32, copy=False)
+    built_index = build_index(embeddings)
+    if model_dir:
+        save_models(model_dir, fitted_vectorizer, built_index)
+    return fitted_vectorizer, built_index
 
-    # Get query embedding
-    query_embedding = np.array(get_embedding(query)).astype("float32")
+def configure(source=DEFAULT_CORPUS_SOURCE, chunk_size=DEFAULT_CHUNK_SIZE, chunk_overlap=DEFAULT_CHUNK_OVERLAP):
+    """Switch corpus settings and rebuild the served corpus and models without re-importing the app"""
+    global _ENV, corpus, texts, vectorizer, index, dimension
+    _ENV = CorpusEnv(source, chunk_size, chunk_overlap)
+    # Copy the documents into plain dicts of our own; the default corpus itself is read-only
+    corpus = [dict(doc) for doc in load_corpus()]
+    # Build FAISS index with TF-IDF embeddings, reusing memoized or persisted models for the same corpus
+    texts = [doc["content"] for doc in corpus]
+    vectorizer, index = build_models(tuple(texts))
+    embedding_cache.clear()  # Embeddings from a previous fit are no longer valid
+    dimension = index.d
+    return corpus
 
-    # Dense retrieval using TF-IDF
-    D, I = index.search(np.array([query_embedding]), k=3)
-    retrieved = [corpus[i] for i in I[0]]
+# Load the corpus and its models from the startup settings
+configure(_ENV.source, _ENV.chunk_size, _ENV.chunk_overlap)
 
-    # Enhanced scoring using Anthropic Claude
+# Helper function to merge TF-IDF and Claude scores for one query's results
+def rank_results(retrieved, tfidf_scores, claude_scores):
+    """Combine TF-IDF and Claude scores for retrieved documents, best match first"""
     results = []
-    for i, doc in enumerate(retrieved):
-        tfidf_score = float(D[0][i])
-        claude_score = analyze_with_claude(doc["content"], query)
+    for doc, tfidf_score, claude_score in zip(retrieved, tfidf_scores, claude_scores):
+        tfidf_score = float(tfidf_score)
         # Combine TF-IDF and Claude scores
         combined_score = (tfidf_score * 0.3) + (claude_score * 0.7)
         results.append({
@@ -201,6 +477,55 @@ def rag_query():
     
     # Sort by combined score
     results.sort(key=lambda x: x["combined_score"], reverse=True)
+    return results
+
+# Helper function shared by both endpoints to find each query's nearest documents
+def retrieve(queries):
+    """Return (documents, TF-IDF scores) for the TOP_K corpus entries nearest each query"""
+    queries = [query[:MAX_QUERY_CHARS] for query in queries]
+    # A single query goes through the embedding cache; a batch is embedded in one vectorizer pass
+    if len(queries) == 1:
+        query_embeddings = get_embedding(queries[0])[np.newaxis, :]
+    else:
+        query_embeddings = get_embeddings(queries)
+
+    # Dense retrieval using TF-IDF, one stacked FAISS search for every query
+    D, I = index.search(query_embeddings, k=TOP_K)
+    results = []
+    for ids, scores in zip(I, D):
+        hits = ids >= 0  # FAISS pads with -1 when the corpus has fewer than TOP_K documents
+        results.append(([corpus[i] for i in ids[hits]], scores[hits]))
+    return results
+
+@app.route("/rag-query", methods=["POST"])
+def rag_query():
+    data = request.json
+    query = data.get("query")
+    retrieved, tfidf_scores = retrieve([query])[0]
+
+    # Enhanced scoring using Anthropic Claude - all documents are scored concurrently
+    claude_scores = analyze_with_claude_batch([(doc["content"], query) for doc in retrieved])
+    return jsonify(rank_results(retrieved, tfidf_scores, claude_scores))
+
+@app.route("/rag-query-batch", methods=["POST"])
+def rag_query_batch():
+    data = request.json
+    queries = data.get("queries") if isinstance(data, dict) else None
+    if not isinstance(queries, list) or not all(isinstance(query, str) for query in queries):
+        return jsonify({"error": "'queries' must be a list of strings"}), 400
+    if not queries:
+        return jsonify([])
+    retrieved = retrieve(queries)
+
+    # Score every (document, query) pair across the batch in one concurrent dispatch
+    claude_scores = analyze_with_claude_batch(
+        [(doc["content"], query) for query, (docs, _) in zip(queries, retrieved) for doc in docs]
+    )
+    results = []
+    offset = 0
+    for docs, tfidf_scores in retrieved:
+        results.append(rank_results(docs, tfidf_scores, claude_scores[offset:offset + len(docs)]))
+        offset += len(docs)
     return jsonify(results)
 
 if __name__ == "__main__":
@@ -5,7 +5,11 @@ Quick Test Runner - Run a subset of tests to verify fixes
 
 import unittest
 import sys
+import orjson
+import numpy as np
 from dotenv import load_dotenv
+import _claude_stub
+import _model_cache
 
 # Load environment variables
 load_dotenv()
@@ -13,13 +17,31 @@ load_dotenv()
 # Import test classes
 from test_integration import TestAppIntegration
 
+
+def setUpModule():
+    """Keep every model cache this module writes in a temporary directory and stub Claude"""
+    _model_cache.start()
+    _claude_stub.start()
+
+
+def tearDownModule():
+    """Restore the real Claude client and delete this module's temporary cache directory"""
+    _claude_stub.stop()
+    _model_cache.stop()
+
+
 class QuickTestSuite(unittest.TestCase):
     """Quick test suite with the most important tests"""
     
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
+        """Create one test client for the suite; the app's Anthropic client is already shared"""
         from app import app
-        self.app = app.test_client()
-        self.app.testing = True
+        cls._client = app.test_client()
+        cls._client.testing = True
+    
+    def setUp(self):
+        self.app = self._client
     
     def test_basic_functionality(self):
         """Test basic app functionality"""
@@ -28,6 +50,8 @@ class QuickTestSuite(unittest.TestCase):
         # Test embedding generation
         embedding = get_embedding("test text")
         self.assertIsNotNone(embedding)
+        self.assertEqual(embedding.dtype, np.float32)  # Half the bytes of float64 through every FAISS search
+        self.assertTrue(embedding.flags['C_CONTIGUOUS'])
         
         # Test Claude analysis
         score = analyze_with_claude("legal contract", "legal risks")
@@ -37,14 +61,12 @@ class QuickTestSuite(unittest.TestCase):
     
     def test_endpoint_basic(self):
         """Test basic endpoint functionality"""
-        import json
-        
         response = self.app.post('/rag-query',
-                               data=json.dumps({"query": "legal risks"}),
+                               data=orjson.dumps({"query": "legal risks"}),
                                content_type='application/json')
         
         self.assertEqual(response.status_code, 200)
-        data = json.loads(response.data)
+        data = orjson.loads(response.data)
         self.assertIsInstance(data, list)
         self.assertGreater(len(data), 0)
 
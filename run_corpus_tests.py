@@ -43,12 +43,28 @@ def setup_test_environment():
     
     return True
 
+def run_with_xdist(test_file):
+    """Run a test file on every CPU core with pytest-xdist; return None if xdist isn't installed"""
+    try:
+        import xdist  # noqa: F401
+    except ImportError:
+        return None
+    
+    # Each worker is its own process, so env changes and app re-imports stay isolated
+    result = subprocess.run([sys.executable, '-m', 'pytest', test_file, '-v', '-n', 'auto'])
+    return result.returncode == 0
+
 def run_unit_tests():
     """Run unit tests for corpus configuration"""
     print("\n" + "="*60)
     print("RUNNING UNIT TESTS - CORPUS CONFIGURATION")
     print("="*60)
     
+    # Spread the tests over every core when pytest-xdist is available
+    parallel_result = run_with_xdist('test_corpus_config.py')
+    if parallel_result is not None:
+        return parallel_result
+    
     # Discover and run unit tests
     loader = unittest.TestLoader()
     suite = unittest.TestSuite()
@@ -83,6 +99,11 @@ def run_integration_tests():
     print("RUNNING INTEGRATION TESTS - CORPUS CONFIGURATION")
     print("="*60)
     
+    # Spread the tests over every core when pytest-xdist is available
+    parallel_result = run_with_xdist('test_corpus_integration.py')
+    if parallel_result is not None:
+        return parallel_result
+    
     # Discover and run integration tests
     loader = unittest.TestLoader()
     suite = unittest.TestSuite()
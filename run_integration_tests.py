@@ -90,14 +90,22 @@ def run_unittest_tests():
         print(f"❌ Error running unittest tests: {e}")
         return False
 
+def parallel_args():
+    """Return pytest-xdist arguments to spread tests over 4 workers, if xdist is installed"""
+    try:
+        import xdist  # noqa: F401
+        return ['-n', '4']
+    except ImportError:
+        return []
+
 def run_pytest_tests():
     """Run tests using pytest"""
     print("\n🧪 Running integration tests with pytest...")
     print("=" * 60)
     
     try:
-        # Run pytest with coverage
-        result = subprocess.run([sys.executable, '-m', 'pytest', 'test_integration.py', '-v'], 
+        # Run pytest with coverage, in parallel when pytest-xdist is available
+        result = subprocess.run([sys.executable, '-m', 'pytest', 'test_integration.py', '-v'] + parallel_args(), 
                               capture_output=False, text=True)
         return result.returncode == 0
     except Exception as e:
@@ -110,7 +118,7 @@ def run_specific_test_class(test_class):
     print("=" * 60)
     
     try:
-        result = subprocess.run([sys.executable, '-m', 'pytest', f'test_integration.py::{test_class}', '-v'], 
+        result = subprocess.run([sys.executable, '-m', 'pytest', f'test_integration.py::{test_class}', '-v'] + parallel_args(), 
                               capture_output=False, text=True)
         return result.returncode == 0
     except Exception as e:
@@ -8,13 +8,15 @@ setup(
     author_email="your.email@example.com",
     packages=find_packages(),
     install_requires=[
-        "flask>=2.0.0",
+        "flask>=2.2.0",
         "numpy>=1.21.0",
         "faiss-cpu>=1.7.0",
         "requests>=2.25.0",
         "python-dotenv>=0.19.0",
         "anthropic>=0.7.0",
-        "scikit-learn>=1.0.0"
+        "scikit-learn>=1.0.0",
+        "orjson>=3.6.0",
+        "joblib>=1.0"
     ],
     python_requires=">=3.8",
     classifiers=[
@@ -13,17 +13,73 @@ This script tests the complete workflow with both default and Mormon cor
 
 import unittest
 import os
-import json
+import contextlib
+import orjson
 import tempfile
 import shutil
-from unittest.mock import patch, mock_open
+from unittest.mock import patch
 from dotenv import load_dotenv
+import _claude_stub
+import _model_cache
+from _content_patterns import LEGAL_RE, LEGAL_OR_RISK_RE, LEGAL_OR_COMPLIANCE_RE, MORMON_RE, MORMON_OR_RECORD_RE
 import numpy as np
 
 # Load environment variables
 load_dotenv()
 
 
+def _encode_query(text):
+    """Encode a /rag-query request body once so tests can post the raw bytes"""
+    return orjson.dumps({'query': text})
+
+
+def _configured_app():
+    """Reconfigure the app module from the current environment instead of re-importing it"""
+    import app
+    env = app.read_corpus_env()
+    app.configure(env.source, env.chunk_size, env.chunk_overlap)
+    return app
+
+
+def _serve_mormon_text(test, text=None):
+    """Point the app at a real temporary Mormon text file holding text, or at a missing one, until the test ends"""
+    import app
+    tmp_dir = tempfile.TemporaryDirectory()
+    test.addCleanup(tmp_dir.cleanup)
+    text_path = os.path.join(tmp_dir.name, 'mormon.txt')
+    if text is not None:
+        with open(text_path, 'w', encoding='utf-8') as file:
+            file.write(text)
+    path_patcher = patch.object(app, 'MORMON_TEXT_PATH', text_path)
+    path_patcher.start()
+    test.addCleanup(path_patcher.stop)
+
+
+def setUpModule():
+    """Replace live Claude calls with a fast deterministic stub for this module"""
+    _model_cache.start()
+    _claude_stub.start()
+
+
+def tearDownModule():
+    """Restore the real Claude client and drop any stubbed scores"""
+    _claude_stub.stop()
+    _model_cache.stop()
+
+
+# Fields every /rag-query result must carry, built once for all result checks
+REQUIRED_KEYS = frozenset({'title', 'content', 'tfidf_score', 'claude_score', 'combined_score'})
+
+# Pre-encoded request bodies for the static queries used below
+QUERY_CONTRACT_LIABILITY = _encode_query("contract liability and legal risks")
+QUERY_NEPHI_HIS_TEACHINGS = _encode_query("Nephi and his teachings")
+QUERY_LEGAL_RISKS = _encode_query("legal risks")
+QUERY_LEGAL_COMPLIANCE = _encode_query("legal compliance")
+QUERY_NEPHI_TEACHINGS = _encode_query("Nephi teachings")
+QUERY_NEPHI_AND_JACOB = _encode_query("Nephi and Jacob")
+QUERY_TREE_OF_LIFE = _encode_query("tree of life meaning representation love of God")
+
+
 class TestCorpusIntegrationWorkflow(unittest.TestCase):
     """End-to-end integration tests for corpus configuration"""
     
@@ -61,6 +117,11 @@ Alma 42:2 Now behold, my son, I will explain unto you this thing; for behold, af
 Alma 42:3 Now, we see that the man had become as God, knowing good and evil; and lest he should put forth his hand, and take also of the tree of life, and eat and live forever, the Lord God placed cherubim and the flaming sword, that he should not partake of the fruit—
 
 Alma 42:4 And thus we see, that there was a time granted unto man to repent, yea, a probationary time, a time to repent and serve God."""
+        
+        # One test client for the whole class; configure() swaps the corpus behind the same Flask app
+        import app
+        cls._client = app.app.test_client()
+        cls._client.testing = True
     
     @classmethod
     def tearDownClass(cls):
@@ -71,30 +132,30 @@ Alma 42:4 And thus we see, that there was a time granted unto man to repent, yea
                 os.environ[key] = value
             elif key in os.environ:
                 del os.environ[key]
+        
+        # Put the shared app back on the restored settings
+        _configured_app()
     
     def setUp(self):
         """Set up test fixtures before each test"""
-        # Clear module cache to force reload
-        import sys
-        if 'app' in sys.modules:
-            del sys.modules['app']
-        
-        # Import app after environment setup
-        from app import app
-        self.app = app.test_client()
-        self.app.testing = True
+        # Parse the mocked test text every time; never read or write the on-disk corpus cache
+        import app
+        cache_patcher = patch.object(app, '_DISABLE_CACHE', True)
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+        
+        # Apply the current environment to the shared app; models are only rebuilt for a new corpus
+        _configured_app()
+        self.app = self._client
     
     def test_default_corpus_workflow(self):
         """Test complete workflow with default corpus"""
         # Set environment for default corpus
         os.environ['CORPUS_SOURCE'] = 'default'
         
-        # Clear module cache to force reload
-        import sys
-        if 'app' in sys.modules:
-            del sys.modules['app']
+        # Apply the current environment to the shared app; models are only rebuilt for a new corpus
+        _configured_app()
         
-        # Re-import to pick up new environment
         from app import load_corpus, get_embedding, analyze_with_claude
         
         # Test corpus loading
@@ -103,12 +164,7 @@ Alma 42:4 And thus we see, that there was a time granted unto man to repent, yea
         self.assertGreater(len(corpus), 0)
         
         # Verify default corpus contains legal content
-        legal_keywords = ['legal', 'contract', 'liability', 'risk', 'compliance']
-        found_legal_content = False
-        for doc in corpus:
-            if any(keyword in doc['content'].lower() for keyword in legal_keywords):
-                found_legal_content = True
-                break
+        found_legal_content = any(LEGAL_OR_COMPLIANCE_RE.search(doc['content']) for doc in corpus)
         self.assertTrue(found_legal_content, "Default corpus should contain legal content")
         
         # Test embedding generation
@@ -123,36 +179,24 @@ Alma 42:4 And thus we see, that there was a time granted unto man to repent, yea
         self.assertGreaterEqual(float(claude_score), 0.0)
         self.assertLessEqual(float(claude_score), 1.0)
         
-        # Test RAG query endpoint with fresh app instance
-        from app import app
-        test_app = app.test_client()
-        test_app.testing = True
-        
-        query = {"query": "contract liability and legal risks"}
-        response = test_app.post('/rag-query',
-                               data=json.dumps(query),
+        # Test RAG query endpoint against the reconfigured app
+        response = self.app.post('/rag-query',
+                               data=QUERY_CONTRACT_LIABILITY,
                                content_type='application/json')
         
         self.assertEqual(response.status_code, 200)
-        data = json.loads(response.data)
+        data = orjson.loads(response.data)
         self.assertIsInstance(data, list)
         self.assertGreater(len(data), 0)
         
         # Verify response structure
         for result in data:
-            self.assertIn('title', result)
-            self.assertIn('content', result)
-            self.assertIn('tfidf_score', result)
-            self.assertIn('claude_score', result)
-            self.assertIn('combined_score', result)
+            self.assertLessEqual(REQUIRED_KEYS, result.keys())
     
-    @patch('builtins.open', new_callable=mock_open)
-    @patch('os.path.exists')
-    def test_mormon_corpus_workflow(self, mock_exists, mock_file):
+    def test_mormon_corpus_workflow(self):
         """Test complete workflow with Mormon corpus"""
-        # Mock file operations
-        mock_exists.return_value = True
-        mock_file.return_value.read.return_value = self.sample_mormon_text
+        # Serve the sample text from a temporary file
+        _serve_mormon_text(self, self.sample_mormon_text)
         
         # Set environment for Mormon corpus
         os.environ['CORPUS_SOURCE'] = 'mormon'
@@ -168,12 +212,7 @@ Alma 42:4 And thus we see, that there was a time granted unto man to repent, yea
         self.assertGreater(len(corpus), 0)
         
         # Verify Mormon corpus contains expected content
-        mormon_keywords = ['Nephi', 'Jacob', 'wilderness', 'Lord', 'record']
-        found_mormon_content = False
-        for doc in corpus:
-            if any(keyword in doc['content'] for keyword in mormon_keywords):
-                found_mormon_content = True
-                break
+        found_mormon_content = any(MORMON_OR_RECORD_RE.search(doc['content']) for doc in corpus)
         self.assertTrue(found_mormon_content, "Mormon corpus should contain Book of Mormon content")
         
         # Verify chunk structure and that chunks respect size limits
@@ -197,30 +236,23 @@ Alma 42:4 And thus we see, that there was a time granted unto man to repent, yea
         self.assertLessEqual(float(claude_score), 1.0)
         
         # Test RAG query endpoint with Mormon-specific query
-        query = {"query": "Nephi and his teachings"}
         response = self.app.post('/rag-query',
-                               data=json.dumps(query),
+                               data=QUERY_NEPHI_HIS_TEACHINGS,
                                content_type='application/json')
         
         self.assertEqual(response.status_code, 200)
-        data = json.loads(response.data)
+        data = orjson.loads(response.data)
         self.assertIsInstance(data, list)
         self.assertGreater(len(data), 0)
         
         # Verify response structure
         for result in data:
-            self.assertIn('title', result)
-            self.assertIn('content', result)
-            self.assertIn('tfidf_score', result)
-            self.assertIn('claude_score', result)
-            self.assertIn('combined_score', result)
+            self.assertLessEqual(REQUIRED_KEYS, result.keys())
     
-    @patch('builtins.open', side_effect=FileNotFoundError)
-    @patch('os.path.exists')
-    def test_mormon_corpus_fallback_workflow(self, mock_exists, mock_file):
+    def test_mormon_corpus_fallback_workflow(self):
         """Test workflow when Mormon corpus file is not found (fallback to default)"""
-        # Mock file doesn't exist
-        mock_exists.return_value = False
+        # Point the app at a file that doesn't exist
+        _serve_mormon_text(self)
         
         # Set environment for Mormon corpus
         os.environ['CORPUS_SOURCE'] = 'mormon'
@@ -234,31 +266,22 @@ Alma 42:4 And thus we see, that there was a time granted unto man to repent, yea
         self.assertGreater(len(corpus), 0)
         
         # Should contain legal content (default corpus)
-        legal_keywords = ['legal', 'contract', 'liability', 'risk']
-        found_legal_content = False
-        for doc in corpus:
-            if any(keyword in doc['content'].lower() for keyword in legal_keywords):
-                found_legal_content = True
-                break
+        found_legal_content = any(LEGAL_OR_RISK_RE.search(doc['content']) for doc in corpus)
         self.assertTrue(found_legal_content, "Should fall back to default legal corpus")
         
         # Test RAG query still works
-        query = {"query": "legal risks"}
         response = self.app.post('/rag-query',
-                               data=json.dumps(query),
+                               data=QUERY_LEGAL_RISKS,
                                content_type='application/json')
         
         self.assertEqual(response.status_code, 200)
-        data = json.loads(response.data)
+        data = orjson.loads(response.data)
         self.assertIsInstance(data, list)
         self.assertGreater(len(data), 0)
     
-    @patch('builtins.open', new_callable=mock_open)
-    @patch('os.path.exists')
-    def test_different_chunk_sizes(self, mock_exists, mock_file):
+    def test_different_chunk_sizes(self):
         """Test Mormon corpus with different chunk sizes"""
-        mock_exists.return_value = True
-        mock_file.return_value.read.return_value = self.sample_mormon_text
+        _serve_mormon_text(self, self.sample_mormon_text)
         
         # Test with small chunks
         os.environ['CORPUS_SOURCE'] = 'mormon'
@@ -273,10 +296,8 @@ Alma 42:4 And thus we see, that there was a time granted unto man to repent, yea
         os.environ['CHUNK_SIZE'] = '800'
         os.environ['CHUNK_OVERLAP'] = '100'
         
-        # Force reload by clearing module cache
-        import sys
-        if 'app' in sys.modules:
-            del sys.modules['app']
+        # Apply the current environment to the shared app; models are only rebuilt for a new corpus
+        _configured_app()
         
         from app import load_corpus
         
@@ -309,10 +330,8 @@ Alma 42:4 And thus we see, that there was a time granted unto man to repent, yea
         # Start with default
         os.environ['CORPUS_SOURCE'] = 'default'
         
-        # Clear module cache to force reload
-        import sys
-        if 'app' in sys.modules:
-            del sys.modules['app']
+        # Apply the current environment to the shared app; models are only rebuilt for a new corpus
+        _configured_app()
         
         from app import load_corpus
         
@@ -320,57 +339,45 @@ Alma 42:4 And thus we see, that there was a time granted unto man to repent, yea
         default_count = len(default_corpus)
         
         # Verify default corpus characteristics
-        legal_content = any('legal' in doc['content'].lower() for doc in default_corpus)
+        legal_content = any(LEGAL_RE.search(doc['content']) for doc in default_corpus)
         self.assertTrue(legal_content)
         
         # Test query with default corpus
-        from app import app
-        test_app = app.test_client()
-        test_app.testing = True
+        response = self.app.post('/rag-query',
+                               data=QUERY_LEGAL_COMPLIANCE,
+                               content_type='application/json')
+        
+        self.assertEqual(response.status_code, 200)
+        default_results = orjson.loads(response.data)
+        
+        # Switch to Mormon corpus (served from a temporary file)
+        _serve_mormon_text(self, self.sample_mormon_text)
+        
+        os.environ['CORPUS_SOURCE'] = 'mormon'
+        os.environ['CHUNK_SIZE'] = '300'
+        
+        # Apply the current environment to the shared app; models are only rebuilt for a new corpus
+        _configured_app()
+        
+        from app import load_corpus
         
-        query = {"query": "legal compliance"}
-        response = test_app.post('/rag-query',
-                               data=json.dumps(query),
+        mormon_corpus = load_corpus()
+        
+        # Verify Mormon corpus characteristics
+        mormon_content = any(MORMON_RE.search(doc['content']) for doc in mormon_corpus)
+        self.assertTrue(mormon_content)
+        
+        # Test query with Mormon corpus through the same client
+        response = self.app.post('/rag-query',
+                               data=QUERY_NEPHI_TEACHINGS,
                                content_type='application/json')
         
         self.assertEqual(response.status_code, 200)
-        default_results = json.loads(response.data)
+        mormon_results = orjson.loads(response.data)
         
-        # Switch to Mormon corpus (with mocked file)
-        with patch('os.path.exists', return_value=True), \
-             patch('builtins.open', mock_open(read_data=self.sample_mormon_text)):
-            
-            os.environ['CORPUS_SOURCE'] = 'mormon'
-            os.environ['CHUNK_SIZE'] = '300'
-            
-            # Force reload
-            if 'app' in sys.modules:
-                del sys.modules['app']
-            
-            from app import load_corpus
-            
-            mormon_corpus = load_corpus()
-            
-            # Verify Mormon corpus characteristics
-            mormon_content = any('Nephi' in doc['content'] for doc in mormon_corpus)
-            self.assertTrue(mormon_content)
-            
-            # Test query with Mormon corpus - create new app instance
-            from app import app
-            test_app_mormon = app.test_client()
-            test_app_mormon.testing = True
-            
-            query = {"query": "Nephi teachings"}
-            response = test_app_mormon.post('/rag-query',
-                                   data=json.dumps(query),
-                                   content_type='application/json')
-            
-            self.assertEqual(response.status_code, 200)
-            mormon_results = json.loads(response.data)
-            
-            # Results should be different between corpus sources
-            self.assertIsInstance(default_results, list)
-            self.assertIsInstance(mormon_results, list)
+        # Results should be different between corpus sources
+        self.assertIsInstance(default_results, list)
+        self.assertIsInstance(mormon_results, list)
     
     def test_environment_variable_validation(self):
         """Test validation of environment variables"""
@@ -379,19 +386,16 @@ Alma 42:4 And thus we see, that there was a time granted unto man to repent, yea
         os.environ['CHUNK_SIZE'] = 'invalid'
         os.environ['CHUNK_OVERLAP'] = '50'
         
-        with patch('os.path.exists', return_value=True), \
-             patch('builtins.open', mock_open(read_data=self.sample_mormon_text)):
-            
-            # Clear module cache to force reload
-            import sys
-            if 'app' in sys.modules:
-                del sys.modules['app']
-            
-            from app import load_corpus
-            
-            # Should handle invalid chunk size gracefully
-            corpus = load_corpus()
-            self.assertIsInstance(corpus, list)
+        _serve_mormon_text(self, self.sample_mormon_text)
+        
+        # Apply the current environment to the shared app; models are only rebuilt for a new corpus
+        _configured_app()
+        
+        from app import load_corpus
+        
+        # Should handle invalid chunk size gracefully
+        corpus = load_corpus()
+        self.assertIsInstance(corpus, list)
         
         # Clean up invalid environment variable for subsequent tests
         os.environ['CHUNK_SIZE'] = '500'
@@ -401,29 +405,27 @@ Alma 42:4 And thus we see, that there was a time granted unto man to repent, yea
         # Create a larger sample text
         large_text = self.sample_mormon_text * 10  # Repeat content
         
-        with patch('os.path.exists', return_value=True), \
-             patch('builtins.open', mock_open(read_data=large_text)):
-            
-            os.environ['CORPUS_SOURCE'] = 'mormon'
-            os.environ['CHUNK_SIZE'] = '300'
-            os.environ['CHUNK_OVERLAP'] = '50'
-            
-            from app import load_corpus
-            
-            corpus = load_corpus()
-            
-            # Should handle larger corpus
-            self.assertGreater(len(corpus), 10)  # Should create many chunks
-            
-            # Test query performance
-            query = {"query": "Nephi and Jacob"}
-            response = self.app.post('/rag-query',
-                                   data=json.dumps(query),
-                                   content_type='application/json')
-            
-            self.assertEqual(response.status_code, 200)
-            data = json.loads(response.data)
-            self.assertIsInstance(data, list)
+        _serve_mormon_text(self, large_text)
+        
+        os.environ['CORPUS_SOURCE'] = 'mormon'
+        os.environ['CHUNK_SIZE'] = '300'
+        os.environ['CHUNK_OVERLAP'] = '50'
+        
+        from app import load_corpus
+        
+        corpus = load_corpus()
+        
+        # Should handle larger corpus
+        self.assertGreater(len(corpus), 10)  # Should create many chunks
+        
+        # Test query performance
+        response = self.app.post('/rag-query',
+                               data=QUERY_NEPHI_AND_JACOB,
+                               content_type='application/json')
+        
+        self.assertEqual(response.status_code, 200)
+        data = orjson.loads(response.data)
+        self.assertIsInstance(data, list)
 
     def test_tree_of_life_citations_and_meanings_real_data(self):
         """Test finding tree of life references with detailed citations and meanings using real Mormon text"""
@@ -437,12 +439,9 @@ Alma 42:4 And thus we see, that there was a time granted unto man to repent, yea
         os.environ['CHUNK_SIZE'] = '800'  # Larger chunks to capture complete verse contexts
         os.environ['CHUNK_OVERLAP'] = '100'
         
-        # Force module reload to pick up new environment
-        import sys
-        if 'app' in sys.modules:
-            del sys.modules['app']
+        # Apply the current environment to the shared app; models are only rebuilt for a new corpus
+        _configured_app()
         
-        # Re-import to pick up new environment
         from app import load_corpus, get_embedding, analyze_with_claude
         
         # Test corpus loading
@@ -535,6 +534,17 @@ Alma 42:4 And thus we see, that there was a time granted unto man to repent, yea
                 if citation_info['verses'] or citation_info['meanings']:
                     tree_of_life_citations.append(citation_info)
         
+        # Freeze the citations into flat arrays so the summary passes below are
+        # vectorized reductions instead of repeated loops over nested dicts
+        citation_count = len(tree_of_life_citations)
+        verse_counts = np.fromiter((len(c['verses']) for c in tree_of_life_citations),
+                                   dtype=np.int32, count=citation_count)
+        meaning_counts = np.fromiter((len(c['meanings']) for c in tree_of_life_citations),
+                                     dtype=np.int32, count=citation_count)
+        verse_references = np.array([v['reference'] for c in tree_of_life_citations for v in c['verses']], dtype=str)
+        verse_texts = np.array([v['text'] for c in tree_of_life_citations for v in c['verses']], dtype=str)
+        verse_texts_lower = np.char.lower(verse_texts)
+        
         # Print detailed citations
         print(f"\nFound {len(tree_of_life_citations)} documents containing tree of life references:")
         print(f"{'-'*80}")
@@ -565,16 +575,8 @@ Alma 42:4 And thus we see, that there was a time granted unto man to repent, yea
                           "Should find at least one tree reference in real Mormon text")
         
         # Verify we found some meaningful tree-related content
-        found_tree_content = False
-        found_representation = False
-        
-        for citation in tree_of_life_citations:
-            for verse in citation['verses']:
-                text_lower = verse['text'].lower()
-                if 'tree' in text_lower:
-                    found_tree_content = True
-                if 'representation' in text_lower:
-                    found_representation = True
+        found_tree_content = bool((np.char.find(verse_texts_lower, 'tree') >= 0).any())
+        found_representation = bool((np.char.find(verse_texts_lower, 'representation') >= 0).any())
         
         self.assertTrue(found_tree_content, 
                        "Should find reference to 'tree' in the passages")
@@ -590,13 +592,12 @@ Alma 42:4 And thus we see, that there was a time granted unto man to repent, yea
         print("RAG QUERY TEST: Tree of Life")
         print(f"{'='*80}")
         
-        query = {"query": "tree of life meaning representation love of God"}
         response = self.app.post('/rag-query',
-                               data=json.dumps(query),
+                               data=QUERY_TREE_OF_LIFE,
                                content_type='application/json')
         
         self.assertEqual(response.status_code, 200)
-        data = json.loads(response.data)
+        data = orjson.loads(response.data)
         self.assertIsInstance(data, list)
         self.assertGreater(len(data), 0)
         
@@ -626,11 +627,7 @@ Alma 42:4 And thus we see, that there was a time granted unto man to repent, yea
         
         # Verify response structure and content
         for result in data:
-            self.assertIn('title', result)
-            self.assertIn('content', result)
-            self.assertIn('tfidf_score', result)
-            self.assertIn('claude_score', result)
-            self.assertIn('combined_score', result)
+            self.assertLessEqual(REQUIRED_KEYS, result.keys())
         
         # Test that at least one result contains tree-related content (since RAG might return different corpus)
         tree_related_found_in_results = any(
@@ -648,8 +645,8 @@ Alma 42:4 And thus we see, that there was a time granted unto man to repent, yea
         print(f"{'='*80}")
         print(f"📊 Total documents with tree of life references: {len(tree_of_life_citations)}")
         
-        total_verses = sum(len(citation['verses']) for citation in tree_of_life_citations)
-        total_meanings = sum(len(citation['meanings']) for citation in tree_of_life_citations)
+        total_verses = int(verse_counts.sum())
+        total_meanings = int(meaning_counts.sum())
         
         print(f"📖 Total verse references found: {total_verses}")
         print(f"💡 Total meaning/interpretation passages: {total_meanings}")
@@ -665,10 +662,9 @@ Alma 42:4 And thus we see, that there was a time granted unto man to repent, yea
         
         # Print specific citations for documentation
         print(f"\n📚 SPECIFIC CITATIONS FOUND:")
-        for citation in tree_of_life_citations:
-            for verse in citation['verses']:
-                if 'tree of life' in verse['text'].lower():
-                    print(f"   • {verse['reference']}: \"{verse['text'][:100]}...\"")
+        tree_of_life_mask = np.char.find(verse_texts_lower, 'tree of life') >= 0
+        for i in np.flatnonzero(tree_of_life_mask):
+            print(f"   • {verse_references[i]}: \"{verse_texts[i][:100]}...\"")
         
         print(f"{'='*80}")
          # Additional test: Verify we can find tree-related content
@@ -696,33 +692,36 @@ Alma 42:4 And thus we see, that there was a time granted unto man to repent, yea
 class TestCorpusConfigurationEdgeCases(unittest.TestCase):
     """Test edge cases and error conditions for corpus configuration"""
     
+    @classmethod
+    def setUpClass(cls):
+        """Create one test client for the whole class"""
+        import app
+        cls._client = app.app.test_client()
+        cls._client.testing = True
+    
     def setUp(self):
         """Set up test fixtures"""
-        # Clear module cache to force reload
-        import sys
-        if 'app' in sys.modules:
-            del sys.modules['app']
-            
-        from app import app
-        self.app = app.test_client()
-        self.app.testing = True
+        # Parse the mocked test text every time; never read or write the on-disk corpus cache
+        import app
+        cache_patcher = patch.object(app, '_DISABLE_CACHE', True)
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+        
+        # Apply the current environment to the shared app; models are only rebuilt for a new corpus
+        _configured_app()
+        self.app = self._client
     
-    @patch('builtins.open', new_callable=mock_open)
-    @patch('os.path.exists')
-    def test_malformed_mormon_text(self, mock_exists, mock_file):
+    def test_malformed_mormon_text(self):
         """Test handling of malformed Mormon text"""
-        # Mock file with malformed content
-        mock_exists.return_value = True
+        # Serve malformed content from a temporary file
         malformed_text = "This is not properly formatted Mormon text without verse references"
-        mock_file.return_value.read.return_value = malformed_text
+        _serve_mormon_text(self, malformed_text)
         
         os.environ['CORPUS_SOURCE'] = 'mormon'
         os.environ['CHUNK_SIZE'] = '300'
         
-        # Clear module cache to force reload
-        import sys
-        if 'app' in sys.modules:
-            del sys.modules['app']
+        # Apply the current environment to the shared app; models are only rebuilt for a new corpus
+        _configured_app()
         
         from app import load_corpus
         
@@ -732,21 +731,16 @@ class TestCorpusConfigurationEdgeCases(unittest.TestCase):
         # Might return empty list or fall back to default
         self.assertIsInstance(corpus, list)
     
-    @patch('builtins.open', new_callable=mock_open)
-    @patch('os.path.exists')
-    def test_very_small_chunk_size(self, mock_exists, mock_file):
+    def test_very_small_chunk_size(self):
         """Test with very small chunk size"""
-        mock_exists.return_value = True
-        mock_file.return_value.read.return_value = "1 Nephi 1:1 Short verse."
+        _serve_mormon_text(self, "1 Nephi 1:1 Short verse.")
         
         os.environ['CORPUS_SOURCE'] = 'mormon'
         os.environ['CHUNK_SIZE'] = '10'  # Very small
         os.environ['CHUNK_OVERLAP'] = '5'
         
-        # Clear module cache to force reload
-        import sys
-        if 'app' in sys.modules:
-            del sys.modules['app']
+        # Apply the current environment to the shared app; models are only rebuilt for a new corpus
+        _configured_app()
         
         from app import load_corpus
         
@@ -766,10 +760,8 @@ class TestCorpusConfigurationEdgeCases(unittest.TestCase):
             if var in os.environ:
                 del os.environ[var]
         
-        # Clear module cache to force reload
-        import sys
-        if 'app' in sys.modules:
-            del sys.modules['app']
+        # Apply the current environment to the shared app; models are only rebuilt for a new corpus
+        _configured_app()
         
         from app import load_corpus
         
@@ -791,16 +783,20 @@ if __name__ == '__main__':
     print("=" * 60)
     
     # Create test suite
-    loader = unittest.TestLoader()
     suite = unittest.TestSuite()
     
     # Add test classes
-    suite.addTests(loader.loadTestsFromTestCase(TestCorpusIntegrationWorkflow))
-    suite.addTests(loader.loadTestsFromTestCase(TestCorpusConfigurationEdgeCases))
+    suite.addTests(unittest.defaultTestLoader.loadTestsFromTestCase(TestCorpusIntegrationWorkflow))
+    suite.addTests(unittest.defaultTestLoader.loadTestsFromTestCase(TestCorpusConfigurationEdgeCases))
     
-    # Run tests
-    runner = unittest.TextTestRunner(verbosity=2, buffer=True)
-    result = runner.run(suite)
+    # Run tests - output buffering is opt-in via TEST_BUFFER=1, and
+    # VERBOSE=0 discards diagnostic prints instead of buffering them
+    runner = unittest.TextTestRunner(verbosity=2, buffer=os.environ.get('TEST_BUFFER', '0').lower() not in ('', '0', 'false', 'no'))
+    if os.environ.get('VERBOSE', '1') == '0':
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            result = runner.run(suite)
+    else:
+        result = runner.run(suite)
     
     # Print summary
     print("\n" + "=" * 60)
@@ -8,21 +8,32 @@ import os
 import sys
 import json
 from dotenv import load_dotenv
+import _model_cache
+from _content_patterns import LEGAL_OR_COMPLIANCE_RE, MORMON_OR_RECORD_RE
 
 # Load environment variables
 load_dotenv()
 
+
+def setUpModule():
+    """Keep every model and corpus cache this module writes in a temporary directory"""
+    _model_cache.start()
+
+
+def tearDownModule():
+    """Delete this module's temporary cache directory"""
+    _model_cache.stop()
+
+
 def test_default_corpus():
     """Test loading default corpus"""
     print("Testing default corpus loading...")
     
-    # Set environment for default corpus
-    os.environ['CORPUS_SOURCE'] = 'default'
-    
     try:
-        from app import load_corpus, app
+        import app
         
-        corpus = load_corpus()
+        # Switch the running app to the default corpus
+        corpus = app.configure('default')
         
         if not corpus:
             print("  ❌ Failed to load default corpus")
@@ -39,8 +50,7 @@ def test_default_corpus():
         print(f"  ✅ Document structure valid")
         
         # Check for legal content
-        legal_keywords = ['legal', 'contract', 'liability', 'risk', 'compliance']
-        found_legal = any(keyword in doc['content'].lower() for doc in corpus for keyword in legal_keywords)
+        found_legal = any(LEGAL_OR_COMPLIANCE_RE.search(doc['content']) for doc in corpus)
         
         if found_legal:
             print("  ✅ Contains expected legal content")
@@ -62,19 +72,11 @@ def test_mormon_corpus():
         print("  ⚠️ Mormon text file not found, skipping test")
         return True
     
-    # Set environment for Mormon corpus
-    os.environ['CORPUS_SOURCE'] = 'mormon'
-    os.environ['CHUNK_SIZE'] = '500'
-    os.environ['CHUNK_OVERLAP'] = '50'
-    
     try:
-        # Clear module cache to force reload
-        if 'app' in sys.modules:
-            del sys.modules['app']
+        import app
         
-        from app import load_corpus
-        
-        corpus = load_corpus()
+        # Switch the running app to the Mormon corpus instead of re-importing it
+        corpus = app.configure('mormon', chunk_size=500, chunk_overlap=50)
         
         if not corpus:
             print("  ❌ Failed to load Mormon corpus")
@@ -91,8 +93,7 @@ def test_mormon_corpus():
         print(f"  ✅ Document structure valid")
         
         # Check for Mormon content
-        mormon_keywords = ['Nephi', 'Jacob', 'Lord', 'wilderness', 'record']
-        found_mormon = any(keyword in doc['content'] for doc in corpus for keyword in mormon_keywords)
+        found_mormon = any(MORMON_OR_RECORD_RE.search(doc['content']) for doc in corpus)
         
         if found_mormon:
             print("  ✅ Contains expected Mormon content")
@@ -163,21 +164,16 @@ def test_environment_variables():
     """Test environment variable handling"""
     print("Testing environment variable handling...")
     
-    # Test with missing variables
-    original_vars = {}
-    for var in ['CORPUS_SOURCE', 'CHUNK_SIZE', 'CHUNK_OVERLAP']:
-        original_vars[var] = os.getenv(var)
-        if var in os.environ:
-            del os.environ[var]
-    
     try:
-        # Clear module cache
-        if 'app' in sys.modules:
-            del sys.modules['app']
+        import app
         
-        from app import load_corpus
+        # Test with missing variables
+        env = app.read_corpus_env({})
+        if (env.source, env.chunk_size, env.chunk_overlap) != ('default', 500, 50):
+            print(f"  ❌ Unexpected defaults for missing environment variables: {env}")
+            return False
         
-        corpus = load_corpus()
+        corpus = app.configure(env.source, env.chunk_size, env.chunk_overlap)
         
         if not corpus:
             print("  ❌ Failed to load corpus with missing environment variables")
@@ -190,12 +186,6 @@ def test_environment_variables():
     except Exception as e:
         print(f"  ❌ Error: {e}")
         return False
-    
-    finally:
-        # Restore environment variables
-        for var, value in original_vars.items():
-            if value is not None:
-                os.environ[var] = value
 
 def main():
     """Run quick validation tests"""
@@ -248,5 +238,9 @@ def main():
         return 1
 
 if __name__ == '__main__':
-    exit_code = main()
+    setUpModule()
+    try:
+        exit_code = main()
+    finally:
+        tearDownModule()
     sys.exit(exit_code)
\ No newline at end of file
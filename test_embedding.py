@@ -4,29 +4,33 @@ Test script to verify the Anthropic integration works correctly.
 """
 
 import os
+import io
+from concurrent.futures import ThreadPoolExecutor
 import anthropic
 from dotenv import load_dotenv
-from sklearn.feature_extraction.text import TfidfVectorizer
 import numpy as np
 
 load_dotenv()
 
+# Shared client so every test reuses one connection pool to the Anthropic API
+_CLIENT = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY")) if os.getenv("ANTHROPIC_API_KEY") else None
 
-def test_anthropic_connection():
+
+def test_anthropic_connection(out=None):
     """Test the Anthropic Claude API connection."""
     
     # Check if API key is set
     api_key = os.getenv("ANTHROPIC_API_KEY")
     if not api_key:
-        print("❌ ANTHROPIC_API_KEY environment variable is not set")
-        print("Please set it with: export ANTHROPIC_API_KEY='your-api-key-here'")
+        print("❌ ANTHROPIC_API_KEY environment variable is not set", file=out)
+        print("Please set it with: export ANTHROPIC_API_KEY='your-api-key-here'", file=out)
         return False
     
-    print("✅ ANTHROPIC_API_KEY is set")
+    print("✅ ANTHROPIC_API_KEY is set", file=out)
     
     try:
-        print("🔄 Testing Anthropic Claude API...")
-        client = anthropic.Anthropic(api_key=api_key)
+        print("🔄 Testing Anthropic Claude API...", file=out)
+        client = _CLIENT
         
         message = client.messages.create(
             model="claude-3-sonnet-20240229",
@@ -40,101 +44,85 @@ def test_anthropic_connection():
         )
         
         response_text = message.content[0].text
-        print(f"✅ Claude responded: {response_text}")
+        print(f"✅ Claude responded: {response_text}", file=out)
         return True
         
     except Exception as e:
-        print(f"❌ Error testing Anthropic API: {e}")
+        print(f"❌ Error testing Anthropic API: {e}", file=out)
         return False
 
 
-def test_tfidf_embeddings():
+def test_tfidf_embeddings(out=None):
     """Test the TF-IDF embedding functionality."""
     
     try:
-        print("🔄 Testing TF-IDF embeddings...")
-        
-        # Sample texts
-        texts = [
-            "The contract exposes the organization to liability due to lack of indemnification clauses.",
-            "Ensure all employees use 2FA to reduce unauthorized access risks.",
-            "Revenue grew by 15% but legal expenses increased due to ongoing litigation."
-        ]
-        
-        # Initialize vectorizer
-        vectorizer = TfidfVectorizer(max_features=100, stop_words='english')
-        vectorizer.fit(texts)
+        print("🔄 Testing TF-IDF embeddings...", file=out)
         
-        # Test embedding generation
+        # Embed through the app's own fitted pipeline so the check exercises what the endpoints run
+        import app
         test_text = "This is a test sentence for embedding."
-        embedding = vectorizer.transform([test_text]).toarray()[0]
+        embedding = app.get_embeddings([test_text])
+        
+        if embedding.dtype != np.float32:
+            print(f"❌ Expected float32 embeddings, got {embedding.dtype}", file=out)
+            return False
         
-        print(f"✅ TF-IDF embedding generated! Dimension: {len(embedding)}")
-        print(f"   Sample values: {embedding[:5]}")
+        print(f"✅ TF-IDF embedding generated! Dimension: {embedding.shape[1]} (non-zero: {np.count_nonzero(embedding)})", file=out)
+        print(f"   Sample values: {embedding[0][embedding[0] != 0][:5]}", file=out)
         return True
         
     except Exception as e:
-        print(f"❌ Error testing TF-IDF embeddings: {e}")
+        print(f"❌ Error testing TF-IDF embeddings: {e}", file=out)
         return False
 
 
-def test_claude_scoring():
+def test_claude_scoring(out=None):
     """Test Claude's relevance scoring functionality."""
     
     api_key = os.getenv("ANTHROPIC_API_KEY")
     if not api_key:
-        print("❌ Cannot test Claude scoring without ANTHROPIC_API_KEY")
+        print("❌ Cannot test Claude scoring without ANTHROPIC_API_KEY", file=out)
         return False
     
     try:
-        print("🔄 Testing Claude relevance scoring...")
-        client = anthropic.Anthropic(api_key=api_key)
-        
+        print("🔄 Testing Claude relevance scoring...", file=out)
         query = "What are the security risks?"
         text = "Ensure all employees use 2FA to reduce unauthorized access risks."
         
-        message = client.messages.create(
-            model="claude-3-sonnet-20240229",
-            max_tokens=10,
-            messages=[
-                {
-                    "role": "user",
-                    "content": f"Rate the relevance of this text to the query on a scale of 0-1. Query: '{query}' Text: '{text}' Return only a number between 0 and 1."
-                }
-            ]
-        )
-        
-        score = float(message.content[0].text.strip())
-        print(f"✅ Claude relevance score: {score}")
+        # Score through the app's own prompt; only successful scores reach claude_cache, never the fallback
+        import app
+        score = app.analyze_with_claude(text, query)
+        if app.claude_cache.get(app.text_digest(query, text)) is None:
+            print("❌ Claude scoring failed; the app fell back to its default score", file=out)
+            return False
+        print(f"✅ Claude relevance score: {score}", file=out)
         
         if 0 <= score <= 1:
-            print("✅ Score is within valid range")
+            print("✅ Score is within valid range", file=out)
             return True
         else:
-            print("❌ Score is outside valid range (0-1)")
+            print("❌ Score is outside valid range (0-1)", file=out)
             return False
             
     except Exception as e:
-        print(f"❌ Error testing Claude scoring: {e}")
+        print(f"❌ Error testing Claude scoring: {e}", file=out)
         return False
 
 
 if __name__ == "__main__":
     print("=== Testing Anthropic Integration ===\n")
     
-    tests_passed = 0
-    total_tests = 3
-    
-    if test_anthropic_connection():
-        tests_passed += 1
+    tests = [test_anthropic_connection, test_tfidf_embeddings, test_claude_scoring]
+    total_tests = len(tests)
     
-    print()
-    if test_tfidf_embeddings():
-        tests_passed += 1
+    # Run the checks concurrently so the Claude round trips overlap; each check
+    # prints to its own buffer so output still appears in the original order
+    buffers = [io.StringIO() for _ in tests]
+    with ThreadPoolExecutor(max_workers=total_tests) as executor:
+        results = list(executor.map(lambda test, buffer: test(out=buffer), tests, buffers))
     
-    print()
-    if test_claude_scoring():
-        tests_passed += 1
+    print("\n\n".join(buffer.getvalue().rstrip("\n") for buffer in buffers))
+    tests_passed = sum(1 for result in results if result)
     
     print(f"\n=== Test Results: {tests_passed}/{total_tests} passed ===")
     
@@ -142,4 +130,4 @@ if __name__ == "__main__":
         print("🎉 All tests passed! Your Anthropic integration is working.")
         print("You can run: python app.py")
     else:
-        print("❌ Some tests failed. Please check your configuration.")
\ No newline at end of file
+        print("❌ Some tests failed. Please check your configuration.")
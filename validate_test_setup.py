@@ -8,8 +8,20 @@ and can run basic functionality tests before running the full integration suite.
 
 import os
 import sys
+import importlib.util
 from dotenv import load_dotenv
 
+# Packages the app needs, as (module name, display name); probed without importing them
+REQUIRED_PACKAGES = [
+    ('flask', 'Flask'),
+    ('numpy', 'NumPy'),
+    ('faiss', 'FAISS'),
+    ('sklearn', 'Scikit-learn'),
+    ('anthropic', 'Anthropic'),
+    ('orjson', 'orjson'),
+    ('joblib', 'joblib'),
+]
+
 def main():
     """Validate test setup"""
     print("🔧 Validating Test Setup for Hybrid Dense Reranker")
@@ -40,43 +52,14 @@ def main():
     else:
         print("⚠️  Not in virtual environment")
     
-    # Test imports
-    print("\n📦 Testing package imports...")
-    
-    try:
-        import flask
-        print("✅ Flask imported successfully")
-    except ImportError:
-        print("❌ Flask import failed")
-        return False
-    
-    try:
-        import numpy
-        print("✅ NumPy imported successfully")
-    except ImportError:
-        print("❌ NumPy import failed")
-        return False
+    # Check packages are installed
+    print("\n📦 Checking installed packages...")
     
-    try:
-        import faiss
-        print("✅ FAISS imported successfully")
-    except ImportError:
-        print("❌ FAISS import failed")
-        return False
-    
-    try:
-        import sklearn
-        print("✅ Scikit-learn imported successfully")
-    except ImportError:
-        print("❌ Scikit-learn import failed")
-        return False
-    
-    try:
-        import anthropic
-        print("✅ Anthropic imported successfully")
-    except ImportError:
-        print("❌ Anthropic import failed")
-        return False
+    for module_name, display_name in REQUIRED_PACKAGES:
+        if importlib.util.find_spec(module_name) is None:
+            print(f"❌ {display_name} not installed")
+            return False
+        print(f"✅ {display_name} installed")
     
     # Test app import
     print("\n🚀 Testing app import...")